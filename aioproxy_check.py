@@ -1,52 +1,42 @@
-import aiohttp
-import asyncio
-import json
+import re
+import sys
+from pathlib import Path
 
+from yarl import URL
 
-async def get_starship(proxy: str):
-    async with aiohttp.ClientSession() as session:
-        try:
-            async with session.get(url=f'https://api.ipify.org?format=json', proxy=proxy, timeout=5) as response:
-                return {"status": True, "message": await response.json(), "proxy": proxy}
-        except Exception as e:
-            return {"status": False, "message": e, "proxy": proxy}
+from utils import run, run_checks
+
+PROXY_FILE = "proxy_list.txt"
+
+# aiohttp only supports HTTP(S) proxies; blank lines, comments and malformed entries are skipped
+PROXY_RE = re.compile(r"^https?://[^\s#]+:\d{1,5}/?$")
+
+
+def is_valid_proxy(entry: str) -> bool:
+    # The regex is a cheap first pass; yarl catches empty hosts, stray paths and out-of-range ports
+    if not PROXY_RE.match(entry):
+        return False
+    try:
+        url = URL(entry)
+        port = url.port
+    except ValueError:
+        return False
+    return bool(url.host) and url.path in ("", "/") and port is not None and 0 < port <= 65535
 
 
 async def main():
-    tasks = []
-    proxy_list = []
-    oks = 0
-    bads = 0
-
-    with open("proxy_list.txt", "r") as proxy_file:
-        for line in proxy_file:
-            proxy_list.append(line.strip())
-
-    for proxy in proxy_list:
-        tasks.append(get_starship(proxy))
-
-    results = await asyncio.gather(*tasks)
-    for result in results:
-        if result['status']:
-            try:
-                if 'ip' in result['message'].keys():
-                    print("{}: {}: {}".format("OK", result['proxy'], result['message']))
-                    oks += 1
-                else:
-                    print("{}: {}: {}".format("BAD", result['proxy'], result['message']))
-                    bads += 1
-            except Exception:
-                print("{}: {}: {}".format("BAD", result['proxy'], result['message']))
-                bads += 1
-        else:
-            print("{}: {}: {}".format("BAD", result['proxy'], result['message']))
-            bads += 1
-
-    print("OKS: {}({}%) / BADS: {}({}%)".format(oks, round(oks / len(proxy_list) * 100), bads,
-                                                round(bads / len(proxy_list) * 100)))
-
-
-# Not used in Python 3.10 or later
-# asyncio.set_event_loop_policy(asyncio.WindowsSelectorEventLoopPolicy())
-
-asyncio.run(main())
+    entries = [line.strip() for line in Path(PROXY_FILE).read_text(encoding="utf-8-sig").splitlines()]
+    entries = [entry for entry in entries if entry and not entry.startswith("#")]
+    proxies = [sys.intern(entry) for entry in entries if is_valid_proxy(entry)]
+    if len(proxies) < len(entries):
+        print("Skipped {} malformed/unsupported lines".format(len(entries) - len(proxies)))
+    # dict.fromkeys() drops duplicate entries while keeping the file order
+    proxy_list = tuple(dict.fromkeys(proxies))
+    if not proxy_list:
+        print("No valid proxies found in {}".format(PROXY_FILE))
+        return
+
+    await run_checks(proxy_list)
+
+
+run(main)
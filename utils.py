@@ -0,0 +1,120 @@
+import aiohttp
+import asyncio
+import ipaddress
+import ssl
+import sys
+from typing import NamedTuple, Optional, Sequence, Tuple
+
+from yarl import URL
+
+# Plaintext endpoint: the body is just the caller's IP address
+CHECK_URL = URL('https://api.ipify.org')
+TIMEOUT = 5
+CONNECT_TIMEOUT = 2
+READ_TIMEOUT = 3
+CONCURRENCY = 256
+MAX_BODY_SIZE = 256
+# Print a line per checked proxy; set to False to only print the summary
+VERBOSE = True
+
+# Dead proxies fail on connect well before the total budget runs out
+CLIENT_TIMEOUT = aiohttp.ClientTimeout(total=TIMEOUT, connect=CONNECT_TIMEOUT, sock_connect=CONNECT_TIMEOUT,
+                                       sock_read=READ_TIMEOUT)
+SSL_CTX = ssl.create_default_context()
+
+
+class Result(NamedTuple):
+    status: bool
+    ip: Optional[str]
+    err: Optional[str]
+    proxy: str
+
+
+async def read_body(response: aiohttp.ClientResponse) -> Optional[bytes]:
+    # read(n) returns whatever has arrived so far, so keep reading until EOF or past the cap
+    body = bytearray()
+    while not response.content.at_eof() and len(body) <= MAX_BODY_SIZE:
+        body += await response.content.read(MAX_BODY_SIZE + 1 - len(body))
+    if len(body) > MAX_BODY_SIZE:
+        return None
+    return bytes(body)
+
+
+async def probe(session: aiohttp.ClientSession, proxy: str, semaphore: asyncio.Semaphore) -> Result:
+    async with semaphore:
+        try:
+            async with session.get(url=CHECK_URL, proxy=URL(proxy)) as response:
+                # Error pages from the proxy are rejected without reading the body
+                if response.status != 200:
+                    return Result(False, None, "HTTP {}".format(response.status), proxy)
+                if (response.content_length or 0) > MAX_BODY_SIZE:
+                    return Result(False, None, "response too large", proxy)
+                raw = await read_body(response)
+                if raw is None:
+                    return Result(False, None, "response too large", proxy)
+                return Result(True, str(ipaddress.ip_address(raw.decode("ascii").strip())), None, proxy)
+        # ValueError covers an unparsable proxy URL and a body that is not an IP address
+        except (aiohttp.ClientError, asyncio.TimeoutError, OSError, ValueError) as e:
+            return Result(False, None, "{}: {}".format(type(e).__name__, e), proxy)
+
+
+def classify(result: Result) -> Tuple[str, str]:
+    if result.status:
+        return "OK", "{}: {}: {}".format("OK", result.proxy, result.ip)
+    return "BAD", "{}: {}: {}".format("BAD", result.proxy, result.err)
+
+
+def report(lines: Sequence[str], oks: int, bads: int, total: int):
+    sys.stdout.writelines(line + "\n" for line in lines)
+
+    checked = oks + bads
+    if checked < total:
+        print("Interrupted after {}/{} checks".format(checked, total))
+    checked = checked or 1
+    print("OKS: {}({}%) / BADS: {}({}%)".format(oks, round(oks / checked * 100), bads,
+                                                round(bads / checked * 100)))
+
+
+async def run_checks(proxy_list: Sequence[str]):
+    lines = []
+    oks = 0
+    bads = 0
+
+    semaphore = asyncio.Semaphore(CONCURRENCY)
+    # Idle proxy tunnels are kept open so repeated checks through the same proxy skip the handshakes
+    connector = aiohttp.TCPConnector(limit=0, ssl=SSL_CTX, use_dns_cache=True, ttl_dns_cache=600,
+                                     force_close=False, keepalive_timeout=60)
+    # Results collected so far are still reported if the run is interrupted (e.g. Ctrl-C)
+    try:
+        async with aiohttp.ClientSession(connector=connector,
+                                         timeout=CLIENT_TIMEOUT,
+                                         cookie_jar=aiohttp.DummyCookieJar(),
+                                         read_bufsize=4096) as session:
+            tasks = [probe(session, proxy, semaphore) for proxy in proxy_list]
+
+            for coro in asyncio.as_completed(tasks):
+                verdict, line = classify(await coro)
+                if verdict == "OK":
+                    oks += 1
+                else:
+                    bads += 1
+                if VERBOSE:
+                    lines.append(line)
+    except (asyncio.CancelledError, KeyboardInterrupt):
+        report(lines, oks, bads, len(proxy_list))
+        raise
+
+    report(lines, oks, bads, len(proxy_list))
+
+
+def run(main):
+    # Not used in Python 3.10 or later
+    # asyncio.set_event_loop_policy(asyncio.WindowsSelectorEventLoopPolicy())
+
+    try:
+        import uvloop
+    except ImportError:
+        # uvloop is not available on Windows, fall back to the default loop
+        uvloop = None
+
+    (uvloop.run if uvloop else asyncio.run)(main())